@@ -14,6 +14,7 @@ setup(
     packages=find_packages(where="src"),
     package_dir={"": "src"},
     install_requires=("botocore", "pyyaml", "troposphere", "e3-core"),
+    extras_require={"orjson": ["orjson"]},
     namespace_packages=["e3"],
     entry_points={"console_scripts": ["e3-aws-assume-role = e3.aws:assume_role_main"]},
 )
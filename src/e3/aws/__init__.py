@@ -392,6 +392,19 @@ def iterate(fun: Callable, key: str, **kwargs: Any) -> Any:
             yield data
 
 
+# Translation table removing ASCII characters that are not alphanumeric
+_NON_ALNUM_DELETION_TABLE = str.maketrans(
+    "", "", "".join(chr(c) for c in range(128) if not chr(c).isalnum())
+)
+_NON_ALNUM_RE = re.compile(r"[^a-zA-Z0-9]")
+_DASH_LOWER_RE = re.compile(r"-([a-z])")
+
+
+def _uppercase_dash_match(match: re.Match) -> str:
+    """Return uppercased character following the dash."""
+    return match.group(1).upper()
+
+
 def name_to_id(name: str) -> str:
     """Convert a resource name to a resource id.
 
@@ -399,12 +412,15 @@ def name_to_id(name: str) -> str:
     resource id must contain only alphanumeric character and first character and
     characters following a dash to uppercase for a better readability.
     """
+    resource_id = name
+    if "-" in resource_id:
+        resource_id = _DASH_LOWER_RE.sub(_uppercase_dash_match, resource_id)
 
-    def replacement(match):
-        """Return uppercased second character of the match."""
-        return match.group(1)[1].upper()
-
-    resource_id = re.sub(r"[^a-zA-Z0-9]", "", re.sub(r"(-[a-z])", replacement, name))
+    # str.translate is faster than a regexp but the table covers only ASCII
+    if resource_id.isascii():
+        resource_id = resource_id.translate(_NON_ALNUM_DELETION_TABLE)
+    else:
+        resource_id = _NON_ALNUM_RE.sub("", resource_id)
     resource_id = resource_id[0].upper() + resource_id[1:]
     return resource_id
 
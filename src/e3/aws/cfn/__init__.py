@@ -413,6 +413,20 @@ class StackEvent:
 class Stack(object):
     """A CloudFormation stack."""
 
+    __slots__ = (
+        "resources",
+        "name",
+        "stack_id",
+        "description",
+        "s3_bucket",
+        "s3_key",
+        "cfn_role_arn",
+        "creation_date",
+        "uuid",
+        "latest_read_event",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         name: str,
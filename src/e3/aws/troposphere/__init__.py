@@ -1,12 +1,26 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from troposphere import AWSObject, Template
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from e3.aws import cfn, name_to_id
 from e3.aws.troposphere.iam.policy_document import PolicyDocument
 from typing import TYPE_CHECKING
+import json
+import sys
+import weakref
 
 if TYPE_CHECKING:
-    from typing import Optional, Union
+    from types import ModuleType
+    from typing import Any, BinaryIO, Callable, Iterable, Optional, Union
+    from troposphere import AWSObject
+
+    ResourceHandler = Callable[[Union["Construct", AWSObject], "Stack"], list]
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class Construct(ABC):
@@ -15,6 +29,8 @@ class Construct(ABC):
     AWSObjects are accessible with resources attribute.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def resources(self, stack: Stack) -> list[AWSObject]:
         """Return a list of troposphere AWSObject.
@@ -47,6 +63,8 @@ class Construct(ABC):
 class Stack(cfn.Stack):
     """Cloudformation stack using troposphere resources."""
 
+    __slots__ = ("constructs", "template", "_id_cache")
+
     def __init__(
         self,
         stack_name: str,
@@ -70,8 +88,15 @@ class Stack(cfn.Stack):
             s3_bucket=s3_bucket,
             s3_key=s3_key,
         )
+        # troposphere is imported only when a stack is created as it
+        # significantly increases the import time
+        from e3.aws.troposphere.template import FastTemplate
+
         self.constructs: list[Construct | AWSObject] = []
-        self.template = Template()
+        self.template: FastTemplate = FastTemplate()
+
+        # Resource ids already computed by __getitem__
+        self._id_cache: dict[str, str] = {}
 
     def add(self, element: Union[AWSObject, Construct, Stack]) -> Stack:
         """Add a Construct or AWSObject to the stack.
@@ -79,57 +104,233 @@ class Stack(cfn.Stack):
         :param element: if a resource an AWSObject or Construct add the resource
              to the stack. If a stack merge its resources into the current stack.
         """
-        if isinstance(element, Stack):
-            constructs = element.constructs
+        return self.add_many([element])
+
+    def add_many(self, elements: Iterable[Union[AWSObject, Construct, Stack]]) -> Stack:
+        """Add several Constructs, AWSObjects or stacks to the stack.
+
+        This is equivalent to calling add on each element but the template is
+        updated only once.
+
+        :param elements: elements to add (see add)
+        """
+        resources: list[AWSObject] = []
+        for element in elements:
+            if isinstance(element, Stack):
+                constructs = element.constructs
 
-        else:
-            constructs = [element]
+            else:
+                constructs = [element]
 
-        # Add the new constructs (non expanded)
-        self.constructs += constructs
+            # Add the new constructs (non expanded)
+            self.constructs.extend(constructs)
+
+            for construct in constructs:
+                handler = _RESOURCE_HANDLERS.get(type(construct))
+                if handler is None:
+                    handler = _resolve_resource_handler(type(construct))
+                resources.extend(handler(construct, self))
 
         # Update the template
-        resources = []
-        for construct in constructs:
-            if isinstance(construct, Construct):
-                resources += construct.resources(stack=self)
-            if isinstance(construct, AWSObject):
-                resources.append(construct)
+        self.template.add_resource(resources)
+
+        return self
+
+    def add_resources(self, resources: Iterable[AWSObject]) -> Stack:
+        """Add troposphere AWSObjects to the stack.
+
+        Contrary to add_many, elements are not checked nor expanded so this
+        should be used only to add AWSObjects.
+
+        :param resources: the AWSObjects to add
+        """
+        resources = list(resources)
+        self.constructs.extend(resources)
         self.template.add_resource(resources)
 
         return self
 
     def cfn_policy_document(self) -> PolicyDocument:
         """Return stack necessary policy document for CloudFormation."""
-        result = PolicyDocument([])
-        for construct in self.constructs:
-            if isinstance(construct, Construct):
-                result += construct.cfn_policy_document(stack=self)
-
-        return result
+        return PolicyDocument(
+            list(
+                chain.from_iterable(
+                    construct.cfn_policy_document(stack=self).statements
+                    for construct in self.constructs
+                    if isinstance(construct, Construct)
+                    # Skip constructs that do not need any permission
+                    and type(construct).cfn_policy_document
+                    is not Construct.cfn_policy_document
+                )
+            )
+        )
 
     def __getitem__(self, resource_name: str) -> AWSObject:
         """Return AWSObject associated with resource_name.
 
         :param resource_name: name of the resource to retrieve
         """
-        return self.template.resources[name_to_id(resource_name)]
+        resource_id = self._id_cache.get(resource_name)
+        if resource_id is None:
+            resource_id = sys.intern(name_to_id(resource_name))
+            self._id_cache[resource_name] = resource_id
+
+        # The returned object might be modified by the caller
+        self.template.invalidate_resource(resource_id)
+        return self.template.resources[resource_id]
+
+    def freeze(self) -> Stack:
+        """Reuse encoded resources between exports.
+
+        This should be called only once all resources have been added and
+        configured (see FastTemplate.freeze).
+        """
+        self.template.freeze()
+        return self
 
     def export(self) -> dict:
         """Export stack as dict.
 
         :return: a dict that can be serialized as YAML to produce a template
         """
-        result = self.template.to_dict()
+        result = self._sections_to_dict()
+        result["Resources"] = self.template.resources_to_dict()
+        return result
+
+    def to_json(self, indent: bool = False) -> bytes:
+        """Export stack as a JSON document.
+
+        orjson is used when available as it is much faster than the json module.
+
+        :param indent: if True indent the JSON document with two spaces
+        :return: the UTF-8 encoded JSON document
+        """
+        return _json_dumps(self.export(), indent=indent)
+
+    def write_json(self, fp: BinaryIO) -> None:
+        """Write stack as a JSON document to a binary file object.
+
+        Resources are encoded and serialized one by one so that neither the
+        whole template dict nor the whole JSON document is held in memory. The
+        output is the same as to_json without indentation.
+
+        :param fp: the binary file object in which to write the JSON document
+        """
+        fp.write(b"{")
+        for key, value in self._sections_to_dict().items():
+            fp.write(_json_dumps(key))
+            fp.write(b":")
+            fp.write(_json_dumps(value))
+            fp.write(b",")
+
+        fp.write(b'"Resources":{')
+        for index, resource_id in enumerate(self.template.resources):
+            if index:
+                fp.write(b",")
+            fp.write(_json_dumps(resource_id))
+            fp.write(b":")
+            fp.write(_json_dumps(self.template.resource_to_dict(resource_id)))
+        fp.write(b"}}")
+
+    def _sections_to_dict(self) -> dict:
+        """Return all the sections of the template but Resources as a dict.
+
+        The stack description, if any, replaces the template one.
+        """
+        result = self.template.sections_to_dict()
         if self.description is not None:
             result["Description"] = self.description
         return result
 
-    def create_data_dir(self, root_dir: str) -> None:
+    def create_data_dir(self, root_dir: str, jobs: int = 1) -> None:
         """Populate root_dir with data needed by all constructs in the stack.
 
         :param root_dir: the local directory in which to store the data
+        :param jobs: maximum number of constructs populating root_dir
+            concurrently. Constructs usually spend most of their time in I/O
+            or in subprocesses so jobs is not bounded by the number of CPUs.
+            Note that the output of constructs running concurrently (e.g: pip
+            install for lambdas) may be interleaved.
         """
-        for construct in self.constructs:
-            if isinstance(construct, Construct):
+        constructs = [
+            construct
+            for construct in self.constructs
+            if isinstance(construct, Construct)
+        ]
+        max_workers = min(jobs, len(constructs))
+        if max_workers <= 1:
+            for construct in constructs:
                 construct.create_data_dir(root_dir)
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(construct.create_data_dir, root_dir)
+                for construct in constructs
+            ]
+            # Propagate exceptions raised by the constructs
+            for future in futures:
+                future.result()
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to JSON using orjson when available.
+
+    :param obj: the object to serialize
+    :param indent: if True indent the JSON document with two spaces
+    :return: the UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    else:
+        # Produce the same output as orjson
+        return json.dumps(
+            obj,
+            ensure_ascii=False,
+            indent=2 if indent else None,
+            separators=None if indent else (",", ":"),
+        ).encode("utf-8")
+
+
+# Functions used by Stack.add to expand an element into AWSObjects, indexed by
+# the element's class so that the isinstance checks are done once per class.
+_RESOURCE_HANDLERS: weakref.WeakKeyDictionary[type, ResourceHandler] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _resolve_resource_handler(kind: type) -> ResourceHandler:
+    """Return and cache the function expanding instances of kind into AWSObjects.
+
+    :param kind: class of the element added to a stack
+    """
+    from troposphere import AWSObject
+
+    handler: ResourceHandler
+    if issubclass(kind, Construct) and issubclass(kind, AWSObject):
+        handler = _construct_and_aws_object_resources
+    elif issubclass(kind, Construct):
+        handler = _construct_resources
+    elif issubclass(kind, AWSObject):
+        handler = _aws_object_resources
+    else:
+        handler = _no_resources
+
+    _RESOURCE_HANDLERS[kind] = handler
+    return handler
+
+
+def _construct_resources(element: Construct, stack: Stack) -> list[AWSObject]:
+    return element.resources(stack=stack)
+
+
+def _aws_object_resources(element: AWSObject, stack: Stack) -> list[AWSObject]:
+    return [element]
+
+
+def _construct_and_aws_object_resources(element: Any, stack: Stack) -> list[AWSObject]:
+    return element.resources(stack=stack) + [element]
+
+
+def _no_resources(element: Any, stack: Stack) -> list[AWSObject]:
+    return []
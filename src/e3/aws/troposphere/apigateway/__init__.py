@@ -1,5 +1,6 @@
 from __future__ import annotations
 from enum import Enum
+from itertools import chain
 from typing import TYPE_CHECKING
 from e3.aws import name_to_id
 from e3.aws.troposphere import Construct
@@ -333,12 +334,14 @@ class HttpApi(Construct):
             )
         )
 
-        # Declare the routes
-        for route in self.route_list:
-            result += self.declare_route(
-                route=route,
-                integration=Ref(logical_id + "Integration"),
+        # Declare the routes. All routes share the same integration
+        integration = Ref(logical_id + "Integration")
+        result.extend(
+            chain.from_iterable(
+                self.declare_route(route=route, integration=integration)
+                for route in self.route_list
             )
+        )
 
         # Declare the domain
         if self.domain_name is not None:
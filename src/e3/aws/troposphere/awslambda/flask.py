@@ -33,7 +33,7 @@ import os
 
 from troposphere import GetAtt
 from e3.aws.troposphere.iam.role import Role
-from e3.fs import cp, sync_tree
+from e3.fs import cp
 from . import Py38Function
 
 if TYPE_CHECKING:
@@ -104,4 +104,3 @@ class Py38FlaskFunction(Py38Function):
             "flask_apigateway2_http_wrapper.py",
         )
         cp(wrapper_file, package_dir)
-        sync_tree(package_dir, "/tmp/nico/package")
@@ -0,0 +1,106 @@
+"""Provide FastTemplate class."""
+
+from __future__ import annotations
+from troposphere import MAX_RESOURCES, AWSObject, Template, encode_to_dict
+from typing import TYPE_CHECKING
+import sys
+
+if TYPE_CHECKING:
+    from typing import Any, Union
+
+
+class FastTemplate(Template):
+    """Troposphere template that can reuse encoded resources between exports.
+
+    By default resources are encoded on each call to to_dict, as done by
+    troposphere. Once the template is frozen (see freeze) each resource is
+    encoded only once and the resulting dicts are reused by subsequent calls.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.frozen = False
+        self.resource_dicts: dict[str, dict] = {}
+
+    def add_resource(
+        self, resource: Union[AWSObject, list[AWSObject]]
+    ) -> Union[AWSObject, list[AWSObject]]:
+        """Add resources to the template.
+
+        :param resource: a resource or a list of resources
+        """
+        if len(self.resources) >= MAX_RESOURCES:
+            raise ValueError("Maximum number of resources %d reached" % MAX_RESOURCES)
+
+        for element in resource if isinstance(resource, list) else [resource]:
+            # Intern the logical ids used as keys so that lookups with ids
+            # interned by Stack.__getitem__ are resolved by identity
+            key = element.title
+            if isinstance(key, str):
+                key = sys.intern(key)
+            if key in self.resources:
+                self.handle_duplicate_key(key)
+            self.resources[key] = element
+
+        return resource
+
+    def freeze(self) -> None:
+        """Reuse encoded resources on subsequent calls to to_dict.
+
+        Once frozen, resources should not be modified anymore unless
+        invalidate_resource is called. Note also that the dicts returned by
+        to_dict are then shared between calls and should not be modified.
+        """
+        self.frozen = True
+
+    def invalidate_resource(self, resource_id: str) -> None:
+        """Encode again a resource on next call to to_dict.
+
+        :param resource_id: the resource logical id
+        """
+        self.resource_dicts.pop(resource_id, None)
+
+    def resource_to_dict(self, resource_id: str) -> dict:
+        """Return the dict representation of a resource.
+
+        :param resource_id: the resource logical id
+        """
+        if not self.frozen:
+            return encode_to_dict(self.resources[resource_id])
+
+        result = self.resource_dicts.get(resource_id)
+        if result is None:
+            result = encode_to_dict(self.resources[resource_id])
+            self.resource_dicts[resource_id] = result
+        return result
+
+    def sections_to_dict(self) -> dict:
+        """Return all the sections of the template but Resources as a dict.
+
+        Sections are the same and in the same order as in Template.to_dict.
+        """
+        sections = {
+            "Description": self.description,
+            "Metadata": self.metadata,
+            "Conditions": self.conditions,
+            "Mappings": self.mappings,
+            "Outputs": self.outputs,
+            "Parameters": self.parameters,
+            "AWSTemplateFormatVersion": self.version,
+            "Transform": self.transform,
+            "Rules": self.rules,
+        }
+        return encode_to_dict({key: value for key, value in sections.items() if value})
+
+    def resources_to_dict(self) -> dict:
+        """Return the Resources section of the template as a dict."""
+        return {
+            resource_id: self.resource_to_dict(resource_id)
+            for resource_id in self.resources
+        }
+
+    def to_dict(self) -> dict:
+        """Return the template as a dict."""
+        result = self.sections_to_dict()
+        result["Resources"] = self.resources_to_dict()
+        return result
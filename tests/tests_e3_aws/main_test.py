@@ -0,0 +1,25 @@
+"""Provide e3.aws tests."""
+
+import pytest
+
+from e3.aws import name_to_id
+
+
+@pytest.mark.parametrize(
+    "name,resource_id",
+    [
+        ("my-bucket", "MyBucket"),
+        ("MyBucket", "MyBucket"),
+        ("my-Bucket", "MyBucket"),
+        ("a--b", "AB"),
+        ("-a", "A"),
+        ("a-", "A"),
+        ("a-1b", "A1b"),
+        ("a_b.c d", "Abcd"),
+        ("café-x", "CafX"),
+        ("é-a", "A"),
+    ],
+)
+def test_name_to_id(name: str, resource_id: str) -> None:
+    """Test conversion of resource names to resource ids."""
+    assert name_to_id(name) == resource_id
@@ -15,24 +15,23 @@ def test_run(capfd: CaptureFixture) -> None:
     aws_env = AWSEnv(regions=["us-east-1"], stub=True)
     stubber = aws_env.stub("sts")
 
+    response = {
+        "Credentials": {
+            "AccessKeyId": "12345678912345678",
+            "SecretAccessKey": "12345678912345678",
+            "SessionToken": "12345678912345678",
+            "Expiration": datetime(4042, 1, 1),
+        }
+    }
+    expected_params = {
+        "RoleArn": "arn:aws:iam::123456789123:role/TestRole",
+        "RoleSessionName": "aws_run_session",
+        "DurationSeconds": 7200,
+    }
+
     # 2 calls to cli_cmd are made in this test
     for _ in range(2):
-        stubber.add_response(
-            "assume_role",
-            {
-                "Credentials": {
-                    "AccessKeyId": "12345678912345678",
-                    "SecretAccessKey": "12345678912345678",
-                    "SessionToken": "12345678912345678",
-                    "Expiration": datetime(4042, 1, 1),
-                }
-            },
-            {
-                "RoleArn": "arn:aws:iam::123456789123:role/TestRole",
-                "RoleSessionName": "aws_run_session",
-                "DurationSeconds": 7200,
-            },
-        )
+        stubber.add_response("assume_role", response, expected_params)
 
     with stubber:
         p_right = aws_env.run(
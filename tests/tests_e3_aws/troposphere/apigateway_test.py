@@ -7,127 +7,8 @@ from e3.aws.troposphere.apigateway import HttpApi, GET, POST
 
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
 
-EXPECTED_TEMPLATE = {
-    "Mypylambda": {
-        "Properties": {
-            "Code": {
-                "S3Bucket": "cfn_bucket",
-                "S3Key": "templates/mypylambda_lambda.zip",
-            },
-            "Timeout": 3,
-            "Description": "this is a test",
-            "Role": "somearn",
-            "FunctionName": "mypylambda",
-            "Runtime": "python3.8",
-            "Handler": "app.main",
-        },
-        "Type": "AWS::Lambda::Function",
-    },
-    "TestapiLogGroup": {
-        "Properties": {"LogGroupName": "testapi"},
-        "Type": "AWS::Logs::LogGroup",
-    },
-    "Testapi": {
-        "Properties": {
-            "Description": "this is a test",
-            "ProtocolType": "HTTP",
-            "Name": "testapi",
-            "DisableExecuteApiEndpoint": "false",
-        },
-        "Type": "AWS::ApiGatewayV2::Api",
-    },
-    "TestapiDefaultStage": {
-        "Properties": {
-            "AccessLogSettings": {
-                "DestinationArn": {"Fn::GetAtt": ["TestapiLogGroup", "Arn"]},
-                "Format": '{"source_ip": "$context.identity.sourceIp", '
-                '"request_time": "$context.requestTime", '
-                '"method": "$context.httpMethod", "route": "$context.routeKey", '
-                '"protocol": "$context.protocol", "status": "$context.status", '
-                '"response_length": "$context.responseLength", '
-                '"request_id": "$context.requestId", '
-                '"integration_error_msg": "$context.integrationErrorMessage"}',
-            },
-            "ApiId": {"Ref": "Testapi"},
-            "AutoDeploy": "true",
-            "Description": "stage $default",
-            "DefaultRouteSettings": {
-                "DetailedMetricsEnabled": "true",
-                "ThrottlingBurstLimit": 10,
-                "ThrottlingRateLimit": 10,
-            },
-            "StageName": "$default",
-        },
-        "Type": "AWS::ApiGatewayV2::Stage",
-    },
-    "TestapiIntegration": {
-        "Properties": {
-            "ApiId": {"Ref": "Testapi"},
-            "IntegrationType": "AWS_PROXY",
-            "IntegrationUri": {"Ref": "Mypylambda"},
-            "PayloadFormatVersion": "2.0",
-        },
-        "Type": "AWS::ApiGatewayV2::Integration",
-    },
-    "TestapiGETapi1Route": {
-        "Properties": {
-            "ApiId": {"Ref": "Testapi"},
-            "AuthorizationType": "NONE",
-            "RouteKey": "GET /api1",
-            "Target": {
-                "Fn::Sub": [
-                    "integrations/${integration}",
-                    {"integration": {"Ref": "TestapiIntegration"}},
-                ]
-            },
-        },
-        "Type": "AWS::ApiGatewayV2::Route",
-    },
-    "TestapiGETapi1LambdaPermission": {
-        "Properties": {
-            "Action": "lambda:InvokeFunction",
-            "FunctionName": {"Ref": "Mypylambda"},
-            "Principal": "apigateway.amazonaws.com",
-            "SourceArn": {
-                "Fn::Sub": [
-                    "arn:aws:execute-api:${AWS::Region}:"
-                    "${AWS::AccountId}:${api}/$default/${route_arn}",
-                    {"api": {"Ref": "Testapi"}, "route_arn": "GET/api1"},
-                ]
-            },
-        },
-        "Type": "AWS::Lambda::Permission",
-    },
-    "TestapiPOSTapi2Route": {
-        "Properties": {
-            "ApiId": {"Ref": "Testapi"},
-            "AuthorizationType": "NONE",
-            "RouteKey": "POST /api2",
-            "Target": {
-                "Fn::Sub": [
-                    "integrations/${integration}",
-                    {"integration": {"Ref": "TestapiIntegration"}},
-                ]
-            },
-        },
-        "Type": "AWS::ApiGatewayV2::Route",
-    },
-    "TestapiPOSTapi2LambdaPermission": {
-        "Properties": {
-            "Action": "lambda:InvokeFunction",
-            "FunctionName": {"Ref": "Mypylambda"},
-            "Principal": "apigateway.amazonaws.com",
-            "SourceArn": {
-                "Fn::Sub": [
-                    "arn:aws:execute-api:${AWS::Region}:"
-                    "${AWS::AccountId}:${api}/$default/${route_arn}",
-                    {"api": {"Ref": "Testapi"}, "route_arn": "POST/api2"},
-                ]
-            },
-        },
-        "Type": "AWS::Lambda::Permission",
-    },
-}
+with open(os.path.join(TEST_DIR, "apigateway_test_http_api.json")) as fd:
+    EXPECTED_TEMPLATE = json.load(fd)
 
 
 def test_http_api(stack: Stack) -> None:
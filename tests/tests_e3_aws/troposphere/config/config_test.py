@@ -1,5 +1,8 @@
 """Provide AWS Config construct tests."""
 
+import json
+import os
+
 from e3.aws.troposphere.config.configuration_recorder import ConfigurationRecorder
 from e3.aws.troposphere.config.config_rule import (
     S3BucketPublicWriteProhibited,
@@ -10,6 +13,11 @@ from e3.aws.troposphere.config.config_rule import (
 )
 from e3.aws.troposphere import Stack
 
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+with open(os.path.join(TEST_DIR, "config_test_recorder.json")) as fd:
+    EXPECTED_RECORDER = json.load(fd)
+
 EXPECTED_RULES = {
     "S3BucketPublicWriteProhibited": {
         "Properties": {
@@ -101,127 +109,6 @@ EXPECTED_RULES = {
     },
 }
 
-EXPECTED_RECORDER = {
-    "AWSServiceRoleForConfig": {
-        "Properties": {"AWSServiceName": "config.amazonaws.com"},
-        "Type": "AWS::IAM::ServiceLinkedRole",
-    },
-    "ConfigRecorder": {
-        "Properties": {
-            "Name": "ConfigRecorder",
-            "RecordingGroup": {
-                "AllSupported": "true",
-                "IncludeGlobalResourceTypes": "true",
-            },
-            "RoleARN": {
-                "Fn::Join": [
-                    ":",
-                    [
-                        "arn",
-                        "aws",
-                        "iam:",
-                        {"Ref": "AWS::AccountId"},
-                        "role/aws-service-role/config.amazonaws.com/"
-                        "AWSServiceRoleForConfig",
-                    ],
-                ]
-            },
-        },
-        "Type": "AWS::Config::ConfigurationRecorder",
-        "DependsOn": "AWSServiceRoleForConfig",
-    },
-    "ConfigTestBucket": {
-        "Properties": {
-            "BucketName": "config-test-bucket",
-            "BucketEncryption": {
-                "ServerSideEncryptionConfiguration": [
-                    {"ServerSideEncryptionByDefault": {"SSEAlgorithm": "AES256"}}
-                ]
-            },
-            "PublicAccessBlockConfiguration": {
-                "BlockPublicAcls": "true",
-                "BlockPublicPolicy": "true",
-                "IgnorePublicAcls": "true",
-                "RestrictPublicBuckets": "true",
-            },
-            "VersioningConfiguration": {"Status": "Enabled"},
-        },
-        "Type": "AWS::S3::Bucket",
-    },
-    "ConfigTestBucketPolicy": {
-        "Properties": {
-            "Bucket": {"Ref": "ConfigTestBucket"},
-            "PolicyDocument": {
-                "Version": "2012-10-17",
-                "Statement": [
-                    {
-                        "Effect": "Deny",
-                        "Principal": {"AWS": "*"},
-                        "Action": "s3:*",
-                        "Resource": "arn:aws:s3:::config-test-bucket/*",
-                        "Condition": {"Bool": {"aws:SecureTransport": "false"}},
-                    },
-                    {
-                        "Effect": "Deny",
-                        "Principal": {"AWS": "*"},
-                        "Action": "s3:PutObject",
-                        "Resource": "arn:aws:s3:::config-test-bucket/*",
-                        "Condition": {
-                            "StringNotEquals": {
-                                "s3:x-amz-server-side-encryption": "AES256"
-                            }
-                        },
-                    },
-                    {
-                        "Effect": "Deny",
-                        "Principal": {"AWS": "*"},
-                        "Action": "s3:PutObject",
-                        "Resource": "arn:aws:s3:::config-test-bucket/*",
-                        "Condition": {
-                            "Null": {"s3:x-amz-server-side-encryption": "true"}
-                        },
-                    },
-                    {
-                        "Effect": "Allow",
-                        "Principal": {"Service": "config.amazonaws.com"},
-                        "Action": "s3:GetBucketAcl",
-                        "Resource": "arn:aws:s3:::config-test-bucket",
-                    },
-                    {
-                        "Effect": "Allow",
-                        "Principal": {"Service": "config.amazonaws.com"},
-                        "Action": "s3:PutObject",
-                        "Resource": {
-                            "Fn::Join": [
-                                "",
-                                [
-                                    "arn:aws:s3:::config-test-bucket",
-                                    "/AWSLogs/",
-                                    {"Ref": "AWS::AccountId"},
-                                    "/Config/*",
-                                ],
-                            ]
-                        },
-                        "Condition": {
-                            "StringEquals": {
-                                "s3:x-amz-acl": "bucket-owner-full-control"
-                            }
-                        },
-                    },
-                ],
-            },
-        },
-        "Type": "AWS::S3::BucketPolicy",
-    },
-    "DeliveryChannel": {
-        "Properties": {
-            "Name": "DeliveryChannel",
-            "S3BucketName": {"Ref": "ConfigTestBucket"},
-        },
-        "Type": "AWS::Config::DeliveryChannel",
-    },
-}
-
 
 def test_config_recorder(stack: Stack) -> None:
     """Test config recorder creation."""
@@ -241,3 +128,17 @@ def test_config_rules(stack: Stack) -> None:
         stack.add(config_rule)
 
     assert stack.export()["Resources"] == EXPECTED_RULES
+
+
+def test_config_rule_per_stack() -> None:
+    """Test that stacks sharing a config rule do not share its resources."""
+    stack = Stack("test-stack", "this is a test stack")
+    other_stack = Stack("test-other-stack", "this is a test stack")
+    stack.add(S3BucketPublicWriteProhibited)
+    other_stack.add(S3BucketPublicWriteProhibited)
+
+    stack["S3BucketPublicWriteProhibited"].ConfigRuleName = "changed"
+    assert (
+        other_stack.export()["Resources"]["S3BucketPublicWriteProhibited"]
+        == EXPECTED_RULES["S3BucketPublicWriteProhibited"]
+    )
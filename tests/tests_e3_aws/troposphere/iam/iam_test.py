@@ -1,6 +1,7 @@
 """Provide IAM construct tests."""
 
 from e3.aws.troposphere.iam.role import Role
+from e3.aws.troposphere.iam.policy_document import PolicyDocument
 from e3.aws.troposphere.iam.policy_statement import Allow
 from e3.aws.troposphere import Stack
 
@@ -56,3 +57,17 @@ def test_statement() -> None:
         "Effect": "Allow",
         "Resource": "*",
     }
+
+
+def test_add_policy_documents() -> None:
+    """Test combining policy documents."""
+    statement = Allow(action="s3:putObject", resource="*")
+    empty = PolicyDocument([])
+    policy_document = PolicyDocument([statement])
+    assert (empty + policy_document).statements == [statement]
+    assert empty.statements == []
+
+    empty += policy_document
+    assert empty.statements == [statement]
+    empty.statements.append(statement)
+    assert policy_document.statements == [statement]
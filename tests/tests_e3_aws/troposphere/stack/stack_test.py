@@ -1,7 +1,24 @@
 """Provide Stack tests."""
 
+from __future__ import annotations
+import gc
+import io
+import json
+import threading
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from troposphere import AWSObject, Output, Parameter, Template, s3
+
+from e3.aws import name_to_id
 from e3.aws.troposphere.s3.bucket import Bucket
-from e3.aws.troposphere import Stack
+from e3.aws.troposphere import Construct, Stack
+
+if TYPE_CHECKING:
+    from _pytest.monkeypatch import MonkeyPatch
 
 
 def test_instanciate() -> None:
@@ -16,3 +33,252 @@ def test_add_and_get_item() -> None:
     stack.add(Bucket("my-bucket"))
     my_bucket = stack["my-bucket"]
     assert my_bucket
+
+
+def test_export_reflects_template_changes() -> None:
+    """Test that each export reflects the current state of the template."""
+    stack = Stack("test-stack", "this is a test stack")
+    stack.add(Bucket("my-bucket"))
+    first = stack.export()
+    first["Resources"].clear()
+    assert "MyBucket" in stack.export()["Resources"]
+
+    stack.template.add_output(Output("BucketName", Value="my-bucket"))
+    assert stack.export()["Outputs"]["BucketName"]["Value"] == "my-bucket"
+
+    stack.add(Bucket("my-other-bucket"))
+    assert "MyOtherBucket" in stack.export()["Resources"]
+
+
+def test_add_many() -> None:
+    """Test adding several constructs at once."""
+    stack = Stack("test-stack", "this is a test stack")
+    stack.add_many([Bucket("my-bucket"), Bucket("my-other-bucket")])
+    assert stack["my-bucket"]
+    assert stack["my-other-bucket"]
+
+
+def test_to_json() -> None:
+    """Test JSON export of a stack."""
+    stack = Stack("test-stack", "this is a test stack")
+    stack.add(Bucket("my-bucket"))
+    assert json.loads(stack.to_json()) == stack.export()
+    assert json.loads(stack.to_json(indent=True)) == stack.export()
+
+
+@pytest.mark.parametrize("indent", [True, False])
+def test_to_json_without_orjson(indent: bool, monkeypatch: MonkeyPatch) -> None:
+    """Test that the json module fallback produces the same output as orjson."""
+    pytest.importorskip("orjson")
+    stack = Stack("test-stack", "this is a test stack \u00e9")
+    stack.add(Bucket("my-bucket"))
+    stack.add(Bucket("my-other-bucket"))
+    expected = stack.to_json(indent=indent)
+    expected_fp = io.BytesIO()
+    stack.write_json(expected_fp)
+
+    monkeypatch.setattr("e3.aws.troposphere.orjson", None)
+    assert stack.to_json(indent=indent) == expected
+    fp = io.BytesIO()
+    stack.write_json(fp)
+    assert fp.getvalue() == expected_fp.getvalue()
+
+
+def test_export_modified_resource() -> None:
+    """Test that resources modified after being added are exported again."""
+    stack = Stack("test-stack", "this is a test stack")
+    bucket = s3.Bucket("MyBucket", BucketName="aaa-bucket")
+    stack.add(bucket)
+    assert stack.export()["Resources"]["MyBucket"]["Properties"]["BucketName"] == (
+        "aaa-bucket"
+    )
+
+    bucket.BucketName = "bbb-bucket"
+    assert stack.export()["Resources"]["MyBucket"]["Properties"]["BucketName"] == (
+        "bbb-bucket"
+    )
+
+
+def test_add_incomplete_resource() -> None:
+    """Test that resources are validated on export rather than on add."""
+    stack = Stack("test-stack", "this is a test stack")
+    policy = s3.BucketPolicy("Pol")
+    stack.add(policy)
+    policy.Bucket = "my-bucket"
+    policy.PolicyDocument = {}
+    assert stack.export()["Resources"]["Pol"]["Properties"]["Bucket"] == "my-bucket"
+
+
+def test_freeze() -> None:
+    """Test that a frozen stack reuses encoded resources."""
+    stack = Stack("test-stack", "this is a test stack")
+    bucket = s3.Bucket("MyBucket", BucketName="aaa-bucket")
+    stack.add(bucket).freeze()
+    first = stack.export()["Resources"]["MyBucket"]
+    assert stack.export()["Resources"]["MyBucket"] is first
+
+    stack["MyBucket"].BucketName = "bbb-bucket"
+    assert stack.export()["Resources"]["MyBucket"]["Properties"]["BucketName"] == (
+        "bbb-bucket"
+    )
+
+
+def test_template_sections_to_dict() -> None:
+    """Test that template sections are exported as done by troposphere."""
+    stack = Stack("test-stack", "this is a test stack")
+    stack.add(Bucket("my-bucket"))
+    stack.template.set_description("this is a test template")
+    stack.template.set_version()
+    stack.template.add_parameter(Parameter("BucketName", Type="String"))
+    stack.template.add_output(Output("BucketName", Value="my-bucket"))
+
+    expected = Template.to_dict(stack.template)
+    del expected["Resources"]
+    assert stack.template.sections_to_dict() == expected
+    assert list(stack.template.sections_to_dict()) == list(expected)
+
+
+def test_write_json() -> None:
+    """Test writing a stack as JSON to a file object."""
+    stack = Stack("test-stack", "this is a test stack")
+    stack.add(Bucket("my-bucket"))
+    stack.add(Bucket("my-other-bucket"))
+    stack.template.add_output(Output("BucketName", Value="my-bucket"))
+    fp = io.BytesIO()
+    stack.write_json(fp)
+    assert json.loads(fp.getvalue()) == stack.export()
+    assert fp.getvalue() == stack.to_json()
+
+
+def test_create_data_dir(tmp_path: Path) -> None:
+    """Test that all constructs of a stack populate the data dir."""
+
+    class DataBucket(Bucket):
+        def create_data_dir(self, root_dir: str) -> None:
+            Path(root_dir, self.name).write_text("data")
+
+    stack = Stack("test-stack", "this is a test stack")
+    stack.add(DataBucket("my-bucket"))
+    stack.add(DataBucket("my-other-bucket"))
+    stack.create_data_dir(str(tmp_path))
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "my-bucket",
+        "my-other-bucket",
+    ]
+
+
+def test_create_data_dir_jobs(tmp_path: Path) -> None:
+    """Test that constructs populate the data dir concurrently."""
+    barrier = threading.Barrier(2, timeout=10)
+
+    class DataBucket(Bucket):
+        def create_data_dir(self, root_dir: str) -> None:
+            # Both constructs must reach this point at the same time
+            barrier.wait()
+            Path(root_dir, self.name).write_text("data")
+
+    stack = Stack("test-stack", "this is a test stack")
+    stack.add(DataBucket("my-bucket"))
+    stack.add(DataBucket("my-other-bucket"))
+    stack.create_data_dir(str(tmp_path), jobs=2)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "my-bucket",
+        "my-other-bucket",
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_create_data_dir_error(tmp_path: Path, jobs: int) -> None:
+    """Test that errors raised by constructs are passed to the caller."""
+
+    class FailingBucket(Bucket):
+        def create_data_dir(self, root_dir: str) -> None:
+            raise RuntimeError(f"cannot create data for {self.name}")
+
+    stack = Stack("test-stack", "this is a test stack")
+    stack.add(Bucket("my-bucket"))
+    stack.add(FailingBucket("my-failing-bucket"))
+    with pytest.raises(RuntimeError, match="my-failing-bucket"):
+        stack.create_data_dir(str(tmp_path), jobs=jobs)
+
+
+def test_add_resources() -> None:
+    """Test adding AWSObjects directly to a stack."""
+    stack = Stack("test-stack", "this is a test stack")
+    other_stack = Stack("test-other-stack", "this is a test stack")
+    stack.add_resources(
+        resource
+        for name in ("my-bucket", "my-other-bucket")
+        for resource in Bucket(name).resources(stack=other_stack)
+    )
+    assert stack["my-bucket"]
+    assert stack["my-other-bucket"]
+
+
+def test_add_slotted_construct() -> None:
+    """Test adding a construct subclass that declares its own slots."""
+
+    class Slotted(Construct):
+        __slots__ = ("name",)
+
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def resources(self, stack: Stack) -> list[AWSObject]:
+            return [s3.Bucket(name_to_id(self.name), BucketName=self.name)]
+
+    construct = Slotted("my-bucket")
+    assert not hasattr(construct, "__dict__")
+
+    stack = Stack("test-stack", "this is a test stack")
+    stack.add(construct)
+    assert stack.export()["Resources"]["MyBucket"]["Properties"]["BucketName"] == (
+        "my-bucket"
+    )
+
+
+def test_resource_handlers_do_not_keep_classes() -> None:
+    """Test that classes added to a stack can be garbage collected."""
+
+    class TmpBucket(Bucket):
+        pass
+
+    Stack("test-stack", "this is a test stack").add(TmpBucket("my-bucket"))
+    ref = weakref.ref(TmpBucket)
+    del TmpBucket
+    gc.collect()
+    assert ref() is None
+
+
+def test_add_untitled_resource() -> None:
+    """Test that resource titles are left untouched when added to a stack."""
+    stack = Stack("test-stack", "this is a test stack")
+    bucket = s3.Bucket(None)
+    stack.add(bucket)
+    assert bucket.title is None
+    assert stack.template.resources[None] is bucket
+
+
+def test_default_cfn_policy_document() -> None:
+    """Test the policy document of constructs that need no permission."""
+
+    class NoPermission(Construct):
+        def resources(self, stack: Stack) -> list[AWSObject]:
+            return []
+
+    stack = Stack("test-stack", "this is a test stack")
+    construct = NoPermission()
+    policy_document = construct.cfn_policy_document(stack=stack)
+    assert policy_document.statements == []
+
+    # The default policy document is not shared between calls
+    policy_document += Bucket("my-bucket").cfn_policy_document(stack=stack)
+    assert policy_document.statements
+    assert construct.cfn_policy_document(stack=stack).statements == []
+
+    stack.add(construct)
+    stack.add(Bucket("my-bucket"))
+    assert (
+        stack.cfn_policy_document().as_dict
+        == Bucket("my-bucket").cfn_policy_document(stack=stack).as_dict
+    )